@@ -22,7 +22,7 @@ from dask.delayed import Delayed, delayed
 from dask.optimization import cull
 from dask.utils import derived_from, random_state_data
 from scipy import sparse
-from toolz import merge, partition_all, remove
+from toolz import merge, partition_all
 
 import sparsity as sp
 from sparsity.dask.indexing import _LocIndexer
@@ -56,10 +56,10 @@ def optimize(dsk, keys, **kwargs):
 
 
 def finalize(results):
-    if all(map(lambda x: x.empty, results)):
+    non_empty = [r for r in results if not r.empty]
+    if not non_empty:
         return results[0]
-    results = [r for r in results if not r.empty]
-    return sp.SparseFrame.vstack(results)
+    return sp.SparseFrame.vstack(non_empty)
 
 
 def from_delayed(dfs, meta=None, divisions=None, prefix="from-delayed"):
@@ -107,7 +107,13 @@ class SparseFrame(dask.base.DaskMethodsMixin):
         self._name = name
         self._meta = make_meta(meta)
 
-        self.divisions = tuple(divisions)
+        self._token = None
+        self._keys = None
+        if divisions is None:
+            npartitions = sum(1 for k in dsk
+                              if isinstance(k, tuple) and k[0] == name)
+            divisions = (None,) * (npartitions + 1)
+        self.divisions = divisions
         self.ndim = 2
 
         self.loc = _LocIndexer(self)
@@ -140,6 +146,23 @@ class SparseFrame(dask.base.DaskMethodsMixin):
     def __dask_postcompute__(self):
         return finalize, ()
 
+    @property
+    def divisions(self):
+        return self._divisions
+
+    @divisions.setter
+    def divisions(self, divisions):
+        self._divisions = tuple(divisions)
+        self._token = None
+        self._keys = None
+
+    @property
+    def _tokenized(self):
+        """Token of graph name and divisions, computed once per frame."""
+        if self._token is None:
+            self._token = tokenize(self._name, self.divisions)
+        return self._token
+
     @property
     def npartitions(self):
         return len(self.divisions) - 1
@@ -208,7 +231,9 @@ class SparseFrame(dask.base.DaskMethodsMixin):
         return elemwise(sp.SparseFrame.add, self, other, meta=self._meta)
 
     def __dask_keys__(self):
-        return [(self._name, i) for i in range(self.npartitions)]
+        if self._keys is None:
+            self._keys = [(self._name, i) for i in range(self.npartitions)]
+        return self._keys
 
     @property
     def _repr_divisions(self):
@@ -457,8 +482,8 @@ def repartition(df, divisions=None, force=False):
     >>> sf = sf.repartition([0, 5, 10, 20])  # doctest: +SKIP
     """
 
-    token = tokenize(df, divisions)
     if isinstance(df, SparseFrame):
+        token = tokenize(df._tokenized, divisions)
         tmp = 'repartition-split-' + token
         out = 'repartition-merge-' + token
         dsk = repartition_divisions(df.divisions, divisions,
@@ -609,7 +634,7 @@ def repartition_divisions(a, b, name, out1, out2, force=False):
 
 def repartition_npartitions(df, npartitions):
     """ Repartition dataframe to a smaller number of partitions """
-    new_name = 'repartition-%d-%s' % (npartitions, tokenize(df))
+    new_name = 'repartition-%d-%s' % (npartitions, df._tokenized)
     if df.npartitions == npartitions:
         return df
     elif df.npartitions > npartitions:
@@ -655,7 +680,7 @@ def repartition_npartitions(df, npartitions):
             return df.repartition(divisions=divisions)
         else:
             ratio = npartitions / df.npartitions
-            split_name = 'split-%s' % tokenize(df, npartitions)
+            split_name = 'split-%s-%d' % (df._tokenized, npartitions)
             dsk = {}
             last = 0
             j = 0
@@ -706,9 +731,13 @@ def elemwise(op, *args, **kwargs):
     # if pd.Series or pd.DataFrame change to dd.DataFrame
     args = _maybe_from_pandas(args)
 
-    # Align DataFrame blocks if divisions are different.
-    from .multi import _maybe_align_partitions  # to avoid cyclical import
-    args = _maybe_align_partitions(args)
+    # Align DataFrame blocks if divisions are different. Frames sharing
+    # a name (or divisions) are aligned already, so skip the check then.
+    frames = [arg for arg in args if isinstance(arg, (_Frame, SparseFrame))]
+    if any(f._name != frames[0]._name and f.divisions != frames[0].divisions
+           for f in frames[1:]):
+        from .multi import _maybe_align_partitions  # avoid cyclical import
+        args = _maybe_align_partitions(args)
 
     # extract all dask instances
     dasks = [arg for arg in args if isinstance(arg, (SparseFrame, _Frame,
@@ -719,25 +748,30 @@ def elemwise(op, *args, **kwargs):
     # We take divisions from the first dask frame
     divisions = dfs[0].divisions
 
+    # check once per input which ones need to be broadcasted
     _is_broadcastable = partial(is_broadcastable, dfs)
-    dfs = list(remove(_is_broadcastable, dfs))
+    bcast = [isinstance(d, Scalar) or _is_broadcastable(d) for d in dasks]
+    dfs = [d for d, b in zip(dasks, bcast) if not b]
     n = len(divisions) - 1
 
     other = [(i, arg) for i, arg in enumerate(args)
              if not isinstance(arg, (_Frame, Scalar, SparseFrame))]
 
     # Get dsks graph tuple keys and adjust the key length of Scalar
-    keys = [d.__dask_keys__() * n if isinstance(d, Scalar) or _is_broadcastable(d)
-            else d.__dask_keys__() for d in dasks]
+    keys = [d.__dask_keys__() * n if b else d.__dask_keys__()
+            for d, b in zip(dasks, bcast)]
 
+    dsk = {}
+    for d in dasks:
+        dsk.update(d.dask)
     if other:
-        dsk = {(_name, i):
-               (apply, partial_by_order, list(frs),
-                {'function': op, 'other': other})
-               for i, frs in enumerate(zip(*keys))}
+        dsk.update({(_name, i):
+                    (apply, partial_by_order, list(frs),
+                     {'function': op, 'other': other})
+                    for i, frs in enumerate(zip(*keys))})
     else:
-        dsk = {(_name, i): (op,) + frs for i, frs in enumerate(zip(*keys))}
-    dsk = merge(dsk, *[d.dask for d in dasks])
+        dsk.update({(_name, i): (op,) + frs
+                    for i, frs in enumerate(zip(*keys))})
 
     if meta is no_default:
         if len(dfs) >= 2 and len(dasks) != len(dfs):
@@ -775,7 +809,7 @@ def map_partitions(func, ddf, meta, name=None, **kwargs):
     
     dsk = {}
     name = name or func.__name__
-    token = tokenize(func, meta, **kwargs)
+    token = tokenize(ddf._tokenized, func, meta, **kwargs)
     name = '{0}-{1}'.format(name, token)
 
     for i in range(ddf.npartitions):
@@ -3,7 +3,8 @@ import functools
 import traceback
 import warnings
 from collections import OrderedDict
-from functools import partial, reduce
+from functools import partial
+from itertools import zip_longest
 
 import numpy as np
 import pandas as pd
@@ -26,11 +27,68 @@ def _is_empty(data):
     return False
 
 
-def _append_zero_row(csr):
-    return sparse.vstack(
-        [csr,
-         sparse.coo_matrix((1, csr.shape[1])).tocsr()]
-    )
+def _ensure_int32(csr):
+    """Return csr with int32 indices and indptr if they can hold its size.
+
+    A new matrix sharing the data array is returned if index arrays have
+    to be downcast, the passed matrix is left untouched.
+    """
+    if csr.indptr.dtype == np.int32 and csr.indices.dtype == np.int32:
+        return csr
+    if max(csr.nnz, *csr.shape) > np.iinfo(np.int32).max:
+        return csr
+    return sparse.csr_matrix((csr.data,
+                              csr.indices.astype(np.int32),
+                              csr.indptr.astype(np.int32)),
+                             shape=csr.shape, copy=False)
+
+
+def _row_segments(csr, idx):
+    """Get start and length of the stored elements of rows `idx` in csr.
+
+    Locations equal to -1 (as returned for missing labels by pandas'
+    join and reindex) are treated as empty rows.
+    """
+    idx = np.asarray(idx, dtype=np.intp)
+    missing = idx == -1
+    if csr.shape[0] == 0:
+        assert np.all(missing), "Can't take existing rows from empty matrix"
+        zeros = np.zeros(len(idx), dtype=csr.indptr.dtype)
+        return zeros, zeros.copy()
+    idx = np.where(missing, 0, idx)
+    starts = csr.indptr[idx]
+    lengths = csr.indptr[idx + 1] - starts
+    lengths[missing] = 0
+    return starts, lengths
+
+
+def _segment_positions(starts, lengths, dtype):
+    """Expand row segments into the positions of all their elements."""
+    offsets = np.zeros(len(lengths), dtype=dtype)
+    np.cumsum(lengths[:-1], out=offsets[1:])
+    return np.arange(lengths.sum(), dtype=dtype) + \
+        np.repeat(starts - offsets, lengths)
+
+
+def _take_rows(csr, idx):
+    """Take rows from a csr matrix by integer location.
+
+    Locations equal to -1 (as returned for missing labels by pandas'
+    join and reindex) result in empty rows. The result is assembled
+    directly from the indptr/indices/data arrays of `csr`.
+    """
+    starts, lengths = _row_segments(csr, idx)
+    # repeated rows can make the result larger than csr itself
+    idx_dtype = csr.indptr.dtype
+    if lengths.sum() > np.iinfo(idx_dtype).max:
+        idx_dtype = np.int64
+    indptr = np.zeros(len(lengths) + 1, dtype=idx_dtype)
+    np.cumsum(lengths, out=indptr[1:])
+    positions = _segment_positions(starts, lengths, indptr.dtype)
+    return sparse.csr_matrix((csr.data[positions],
+                              csr.indices[positions],
+                              indptr),
+                             shape=(len(lengths), csr.shape[1]))
 
 
 class SparseFrame(object):
@@ -198,12 +256,49 @@ class SparseFrame(object):
         return dense
 
     def _init_csr(self, csr):
-        """Keep a zero row at the end of the csr matrix for aligns."""
+        csr = _ensure_int32(csr)
         self.shape = csr.shape
-        if not self.empty:
-            self._data = _append_zero_row(csr)
-        else:
-            self._data = csr
+        self._data = csr
+
+    @property
+    def _data(self):
+        """Underlying csr matrix including columns assigned so far."""
+        # matrix and buffered columns are kept in a single tuple, so
+        # concurrent readers always see a consistent pair
+        csr, pending = self._csr_pending
+        if pending:
+            new_cols = sparse.hstack(pending, format='csr')
+            csr = _csr_hstack(csr, new_cols)
+            self._csr_pending = (csr, [])
+        return csr
+
+    @_data.setter
+    def _data(self, csr):
+        self._csr_pending = (csr, [])
+
+    @property
+    def _columns(self):
+        """Column labels as pd.Index, created lazily from _columns_arr."""
+        if self._columns_idx is None:
+            self._columns_idx = _ensure_index(self._columns_values)
+        return self._columns_idx
+
+    @_columns.setter
+    def _columns(self, columns):
+        self._columns_idx = _ensure_index(columns)
+        self._columns_values = None
+
+    @property
+    def _columns_arr(self):
+        """Column labels as array, created lazily from _columns."""
+        if self._columns_values is None:
+            self._columns_values = np.asarray(self._columns_idx)
+        return self._columns_values
+
+    @_columns_arr.setter
+    def _columns_arr(self, labels):
+        self._columns_values = labels
+        self._columns_idx = None
 
     def _get_axis(self, axis):
         """Rudimentary indexing support."""
@@ -383,9 +478,7 @@ class SparseFrame(object):
         -------
             data: scipy.spar.csr_matrix
         """
-        if self.empty:
-            return self._data
-        return self._data[:-1, :]
+        return self._data
 
     def groupby_agg(self, by=None, level=None, agg_func=None):
         """ Aggregate data using callable.
@@ -420,8 +513,8 @@ class SparseFrame(object):
     def groupby_sum(self, by=None, level=0):
         """Optimized sparse groupby sum aggregation.
 
-        Simple operation using sparse matrix multiplication.
-        Expects result to be sparse as well.
+        Rows are sorted by group and summed up in a single pass over
+        the csr arrays. Expects result to be sparse as well.
 
         The by and level arguments are mutually exclusive.
 
@@ -438,10 +531,8 @@ class SparseFrame(object):
             Grouped by and summed SparseFrame.
         """
         by, cols = self._get_groupby_col(by, level)
-        group_idx = by.argsort()
-        gm = _create_group_matrix(by[group_idx])
-        grouped_data = self._data[group_idx, :].T.dot(gm).T
-        res = SparseFrame(grouped_data, index=np.unique(by),
+        grouped_data, new_idx = _sparse_groupby_sum(self._data, by)
+        res = SparseFrame(grouped_data, index=new_idx,
                           columns=self._columns)
         return res[cols]
 
@@ -493,15 +584,15 @@ class SparseFrame(object):
         if axis not in {0, 1}:
             raise ValueError("Axis mut be either 0 or 1.")
         if axis == 0:
-            if np.array_equal(other._columns.values, self._columns.values):
+            if np.array_equal(other._columns_arr, self._columns_arr):
                 # take short path if join axes are identical
-                data = sparse.vstack([self.data, other.data])
+                data = _csr_vstack([self.data, other.data])
                 index = np.hstack([self.index, other.index])
                 res = SparseFrame(data, index=index, columns=self._columns)
             else:
                 data, new_index = _matrix_join(
-                    _append_zero_row(self.data.T.tocsr()),
-                    _append_zero_row(other.data.T.tocsr()),
+                    self.data.T.tocsr(),
+                    other.data.T.tocsr(),
                     self._columns,
                     other._columns,
                     how=how,
@@ -512,29 +603,18 @@ class SparseFrame(object):
         elif axis == 1:
             if np.array_equal(self.index.values, other.index.values):
                 # take short path if join axes are identical
-                data = sparse.hstack([self.data, other.data])
-                columns = np.hstack([self._columns, other._columns])
+                data = _csr_hstack(self.data, other.data)
+                columns = np.concatenate([self._columns_arr,
+                                          other._columns_arr])
                 res = SparseFrame(data, index=self.index, columns=columns)
             else:
-                if other.empty:
-                    other_data = sparse.csr_matrix((1, other.shape[1]),
-                                                   dtype=other.data.dtype)
-                else:
-                    other_data = other._data
-
-                if self.empty:
-                    self_data = sparse.csr_matrix((1, self.shape[1]),
-                                                  dtype=self.data.dtype)
-                else:
-                    self_data = self._data
-
-                data, new_index = _matrix_join(self_data, other_data,
+                data, new_index = _matrix_join(self._data, other._data,
                                                self.index, other.index,
                                                how=how)
                 res = SparseFrame(data,
                                   index=new_index,
-                                  columns=np.concatenate([self._columns,
-                                                          other._columns]))
+                                  columns=np.concatenate([self._columns_arr,
+                                                          other._columns_arr]))
         else:
             raise ValueError('Axis must be either 0 or 1.')
 
@@ -581,7 +661,7 @@ class SparseFrame(object):
             sorted: sparsity.SparseFrame
         """
         passive_sort_idx = np.argsort(self._index)
-        data = self._data[passive_sort_idx]
+        data = _take_rows(self._data, passive_sort_idx)
         index = self._index[passive_sort_idx]
         return SparseFrame(data, index=index, columns=self.columns)
 
@@ -603,7 +683,7 @@ class SparseFrame(object):
         _data.data[np.isnan(self._data.data)] = value
         if value == 0:
             _data.eliminate_zeros()
-        return SparseFrame(data=_data[:-1, :],
+        return SparseFrame(data=_data,
                            index=self.index, columns=self.columns)
 
     def add(self, other, how='outer', fill_value=0, **kwargs):
@@ -629,7 +709,7 @@ class SparseFrame(object):
         if fill_value != 0:
             raise ValueError("Only 0 is accepted as fill_value "
                              "for sparse data.")
-        assert np.all(self._columns == other.columns)
+        assert np.array_equal(self._columns_arr, other._columns_arr)
         data, new_idx = _aligned_csr_elop(self._data, other._data,
                                           self.index, other.index,
                                           how=how)
@@ -649,15 +729,14 @@ class SparseFrame(object):
 
     def __repr__(self):
         nrows = min(5, self.shape[0])
+        head = self.data[:nrows, :]
 
         if len(self._columns) > 50:
             cols = self.columns[:25].append(self.columns[-25:])
-            data = sparse.hstack([self.data[:nrows, :25],
-                                  self.data[:nrows, -25:]])
-            data = data.toarray()
+            data = _csr_hstack(head[:, :25], head[:, -25:]).toarray()
         else:
             cols = self._columns
-            data = self.data[:nrows, :].toarray()
+            data = head.toarray()
 
         df = pd.DataFrame(data, columns=cols, index=self._index[:nrows])
         df_str = df.__repr__().splitlines()
@@ -692,9 +771,7 @@ class SparseFrame(object):
         head: SparseFrame
         """
         n = min(n, len(self._index))
-        return pd.SparseDataFrame(self.data[:n, :].todense(),
-                                  index=self.index[:n],
-                                  columns=self.columns)
+        return self._slice(slice(0, n))
 
     def _slice(self, sliceobj):
         return SparseFrame(self.data[sliceobj, :],
@@ -705,7 +782,9 @@ class SparseFrame(object):
     def concat(cls, tables, axis=0):
         """Concat a collection of SparseFrames along given axis.
 
-        Uses join internally so it might not be very efficient.
+        Uses join internally so it might not be very efficient. Tables
+        are joined pairwise in a balanced tree, so every row is copied
+        O(log(len(tables))) times.
 
         Parameters
         ----------
@@ -719,7 +798,13 @@ class SparseFrame(object):
 
         """
         func = partial(SparseFrame.join, axis=axis)
-        return reduce(func, tables)
+        tables = list(tables)
+        if not tables:
+            raise ValueError("No tables to concatenate.")
+        while len(tables) > 1:
+            tables = [a if b is None else func(a, b)
+                      for a, b in zip_longest(tables[::2], tables[1::2])]
+        return tables[0]
 
     def _ixs(self, key, axis=0):
         if axis != 0:
@@ -744,9 +829,9 @@ class SparseFrame(object):
         -------
         assigned: SparseFrame
         """
-        sf = self
+        sf = self.copy(deep=False)
         for key, value in kwargs.items():
-            sf = sf._single_assign(key, value)
+            sf[key] = value
         return sf
 
     def __setitem__(self, key, value):
@@ -754,25 +839,17 @@ class SparseFrame(object):
             raise NotImplementedError("Assigning to an existing column "
                                       "is currently not implemented. You can "
                                       "only assign values to new columns.")
-        new_cols, new_data = self._add_col(key, value)
-        self._init_csr(new_data)
-        self._columns = new_cols
-
-    def _add_col(self, key, value):
-        csc = self.data.tocsc()
+        # new columns are buffered and only appended to the csr matrix
+        # once data is accessed again, see _data. Converting here makes
+        # unsupported values fail before the frame is modified.
         value = np.broadcast_to(np.atleast_1d(value), (self.shape[0],))
-        val = value.reshape(-1, 1)
-        new_data = sparse.hstack([csc, sparse.csc_matrix(val)]).tocsr()
-        new_cols = self._columns.append(pd.Index([key]))
-        return new_cols, new_data
-
-    def _single_assign(self, key, value):
-        if key in self.columns:
-            raise NotImplementedError("Assigning to an existing column "
-                                      "is currently not implemented. You can "
-                                      "only assign values to new columns.")
-        new_cols, new_data = self._add_col(key, value)
-        return SparseFrame(new_data, index=self.index, columns=new_cols)
+        col = sparse.csr_matrix(value.reshape(-1, 1))
+        # rebind instead of appending, shallow copies share the list
+        csr, pending = self._csr_pending
+        self._csr_pending = (csr, pending + [col])
+        self._columns = self._columns.append(pd.Index([key]))
+        self.shape = (self.shape[0], self.shape[1] + 1)
+        self.empty = _is_empty(self)
 
     def drop(self, labels, axis=1):
         """Drop label(s) from given axis.
@@ -881,10 +958,8 @@ class SparseFrame(object):
         assert np.all([np.all(frames[0].columns == frame.columns)
                        for frame in frames[1:]]), "Columns don't match"
         data = list(map(lambda x: x.data, frames))
-        new_idx = frames[0].index
-        for f in frames[1:]:
-            new_idx = new_idx.append(f.index)
-        return SparseFrame(sparse.vstack(data),
+        new_idx = frames[0].index.append([f.index for f in frames[1:]])
+        return SparseFrame(_csr_vstack(data),
                            index=new_idx,
                            columns=frames[0].columns)
 
@@ -1023,7 +1098,7 @@ class SparseFrame(object):
             new_index, idx = self.index.reindex(labels)
             if idx is None:
                 return self.copy()
-            new_data = self._data[idx]
+            new_data = _take_rows(self._data, idx)
         elif axis == 1:
             self.columns._can_reindex(labels)
             reindex_axis = 'columns'
@@ -1031,10 +1106,7 @@ class SparseFrame(object):
             new_index, idx = self.columns.reindex(labels)
             if idx is None:
                 return self.copy()
-            new_data = self._data.T[idx].T
-            if not self.empty:
-                # we have a hidden zero column to replace missing indices (-1)
-                new_data = new_data[:-1]
+            new_data = _take_rows(self._data.T.tocsr(), idx).T.tocsr()
         else:
             raise ValueError("Only two dimensional data supported.")
 
@@ -1070,60 +1142,217 @@ def _axis_is_empty(csr, axis=0):
     return csr.shape[axis] == 0
 
 
+def _csr_hstack(a, b):
+    """Stack two csr matrices with equal number of rows horizontally.
+
+    Row segments of both matrices are written directly into the output
+    arrays, so no coo intermediate has to be built.
+    """
+    a_len = np.diff(a.indptr)
+    b_len = np.diff(b.indptr)
+    idx_dtype = np.result_type(a.indptr.dtype, b.indptr.dtype)
+    if max(a.nnz + b.nnz, a.shape[1] + b.shape[1]) > \
+            np.iinfo(idx_dtype).max:
+        idx_dtype = np.int64
+    indptr = a.indptr.astype(idx_dtype) + b.indptr
+    a_pos = np.arange(a.nnz) + np.repeat(b.indptr[:-1], a_len)
+    b_pos = np.arange(b.nnz) + np.repeat(a.indptr[1:], b_len)
+
+    data = np.empty(indptr[-1], dtype=np.result_type(a.dtype, b.dtype))
+    indices = np.empty(indptr[-1], dtype=idx_dtype)
+    data[a_pos] = a.data[:a.nnz]
+    data[b_pos] = b.data[:b.nnz]
+    indices[a_pos] = a.indices[:a.nnz]
+    indices[b_pos] = b.indices[:b.nnz].astype(idx_dtype) + a.shape[1]
+    return sparse.csr_matrix((data, indices, indptr),
+                             shape=(a.shape[0], a.shape[1] + b.shape[1]))
+
+
+def _csr_vstack(csrs):
+    """Stack csr matrices with equal number of columns vertically.
+
+    The output arrays are allocated once for the total number of rows
+    and stored elements and filled with a copy of every input matrix.
+    """
+    n_rows = sum(m.shape[0] for m in csrs)
+    nnz = sum(m.nnz for m in csrs)
+    idx_dtype = np.result_type(*[m.indptr.dtype for m in csrs])
+    if nnz > np.iinfo(idx_dtype).max:
+        idx_dtype = np.int64
+
+    data = np.empty(nnz, dtype=np.result_type(*[m.dtype for m in csrs]))
+    indices = np.empty(nnz, dtype=idx_dtype)
+    indptr = np.empty(n_rows + 1, dtype=idx_dtype)
+    indptr[0] = 0
+    row = pos = 0
+    for m in csrs:
+        data[pos:pos + m.nnz] = m.data[:m.nnz]
+        indices[pos:pos + m.nnz] = m.indices[:m.nnz]
+        indptr[row + 1:row + m.shape[0] + 1] = m.indptr[1:]
+        indptr[row + 1:row + m.shape[0] + 1] += pos
+        row += m.shape[0]
+        pos += m.nnz
+    return sparse.csr_matrix((data, indices, indptr),
+                             shape=(n_rows, csrs[0].shape[1]))
+
+
 def _aligned_csr_elop(a, b, a_idx, b_idx, op='_plus_', how='outer'):
-    """Assume data == 0 at loc[-1]"""
+    """Align rows of a and b by their index labels and apply op."""
 
     # handle emtpy cases
     if _axis_is_empty(a):
-        return b[:-1, :], b_idx
+        return b, b_idx
 
     if _axis_is_empty(b):
-        return a[:-1, :], a_idx
+        return a, a_idx
 
-    join_idx, lidx, ridx = a_idx.join(b_idx, return_indexers=True, how=how)
+    a_idx = _ensure_index(a_idx)
+    b_idx = _ensure_index(b_idx)
 
-    if lidx is None:
-        a_new = a[:-1, :]
-    else:
-        a_new = sparse.csr_matrix(a[lidx])
-    if ridx is None:
-        b_new = b[:-1, :]
-    else:
-        b_new = sparse.csr_matrix(b[ridx])
+    # take short path if indexes are identical
+    if a_idx.is_unique and (a_idx is b_idx or
+                            (len(a_idx) == len(b_idx) and
+                             a_idx.equals(b_idx))):
+        return a._binopt(b, op=op), a_idx
+
+    indexers = _monotonic_subset_join(a_idx, b_idx, how=how)
+    if indexers is None:
+        indexers = a_idx.join(b_idx, return_indexers=True, how=how)
+    join_idx, lidx, ridx = indexers
+
+    a_new = a if lidx is None else _take_rows(a, lidx)
+    b_new = b if ridx is None else _take_rows(b, ridx)
 
     assert b_new.shape == a_new.shape
     added = a_new._binopt(b_new, op=op)
     return added, join_idx
 
 
+def _monotonic_subset_join(a_idx, b_idx, how='outer'):
+    """Join sorted unique indexes where one index contains the other.
+
+    Locates the labels of the smaller index in the larger one by binary
+    search instead of going through pandas' join machinery. Returns
+    join index and indexers like pd.Index.join or None if the indexes
+    don't qualify for this shortcut.
+    """
+    if isinstance(a_idx, pd.MultiIndex) or isinstance(b_idx, pd.MultiIndex) \
+            or a_idx.dtype != b_idx.dtype:
+        return None
+    if not (a_idx.is_monotonic_increasing and a_idx.is_unique and
+            b_idx.is_monotonic_increasing and b_idx.is_unique):
+        return None
+
+    swapped = len(a_idx) < len(b_idx)
+    sup, sub = (b_idx, a_idx) if swapped else (a_idx, b_idx)
+    pos = sup.values.searchsorted(sub.values)
+    if len(pos) and (pos[-1] >= len(sup) or
+                     not np.array_equal(sup.values[pos], sub.values)):
+        return None
+
+    result_side = {'outer': 'sup', 'inner': 'sub',
+                   'left': 'sub' if swapped else 'sup',
+                   'right': 'sup' if swapped else 'sub'}[how]
+    if result_side == 'sup':
+        join_idx = sup
+        sup_indexer = None
+        sub_indexer = np.full(len(sup), -1, dtype=np.intp)
+        sub_indexer[pos] = np.arange(len(sub))
+    else:
+        join_idx = sub
+        sup_indexer = pos
+        sub_indexer = None
+
+    if swapped:
+        return join_idx, sub_indexer, sup_indexer
+    return join_idx, sup_indexer, sub_indexer
+
+
 def _matrix_join(a, b, a_idx, b_idx, how='outer'):
-    """Assume data == 0 at loc[-1]"""
+    """Join rows of a and b by their index labels, missing rows are empty.
+
+    Every output row consists of the row segment of a followed by the
+    (column shifted) row segment of b. Both are copied straight into
+    the output arrays, so neither aligned intermediate matrices nor a
+    coo based hstack are needed.
+    """
     join_idx, lidx, ridx = a_idx.join(b_idx, return_indexers=True,
                                       how=how)
-    if lidx is None:
-        a_new = a[:-1, :]
-    else:
-        a_new = sparse.csr_matrix(a[lidx])
-    if ridx is None:
-        b_new = b[:-1, :]
-    else:
-        b_new = sparse.csr_matrix(b[ridx])
+    n_rows = len(join_idx)
+    a_starts, a_len = _row_segments(
+        a, np.arange(n_rows) if lidx is None else lidx)
+    b_starts, b_len = _row_segments(
+        b, np.arange(n_rows) if ridx is None else ridx)
+
+    shape = (n_rows, a.shape[1] + b.shape[1])
+    idx_dtype = np.result_type(a.indptr.dtype, b.indptr.dtype)
+    if max(a_len.sum() + b_len.sum(), shape[1]) > np.iinfo(idx_dtype).max:
+        idx_dtype = np.int64
+    indptr = np.zeros(n_rows + 1, dtype=idx_dtype)
+    np.cumsum(a_len, out=indptr[1:])
+    indptr[1:] += np.cumsum(b_len)
+
+    data = np.empty(indptr[-1], dtype=np.result_type(a.dtype, b.dtype))
+    indices = np.empty(indptr[-1], dtype=idx_dtype)
+    a_src = _segment_positions(a_starts, a_len, idx_dtype)
+    a_dst = _segment_positions(indptr[:-1], a_len, idx_dtype)
+    b_src = _segment_positions(b_starts, b_len, idx_dtype)
+    b_dst = _segment_positions(indptr[:-1] + a_len, b_len, idx_dtype)
+    data[a_dst] = a.data[a_src]
+    data[b_dst] = b.data[b_src]
+    indices[a_dst] = a.indices[a_src]
+    indices[b_dst] = b.indices[b_src].astype(idx_dtype) + a.shape[1]
+
+    data = sparse.csr_matrix((data, indices, indptr), shape=shape)
+    return data, join_idx
 
-    data = sparse.hstack([a_new, b_new])
 
-    return data, join_idx
+def _group_order(by):
+    """Order rows by group label.
+
+    Integer labels spanning less than 2**16 values are sorted as uint16
+    offsets, for which numpy's stable sort is a linear time radix sort.
+    """
+    if by.dtype.kind in 'iu' and len(by):
+        low = by.min()
+        if int(by.max()) - int(low) < 2 ** 16:
+            # differences are exact modulo 2**64, even for uint64 labels
+            offsets = by.astype(np.int64) - np.array(low).astype(np.int64)
+            return np.argsort(offsets.astype(np.uint16), kind='stable')
+    return by.argsort()
+
+
+def _sparse_groupby_sum(csr, by):
+    """Sum up rows of a csr matrix which share the same label in `by`.
 
+    Rows are brought into group order, then every group is treated as a
+    single csr row whose duplicate column entries are summed up. This
+    avoids building a group indicator matrix and multiplying with it.
 
-def _create_group_matrix(group_idx, dtype='f8'):
-    """Create a matrix based on groupby index labels."""
-    if not isinstance(group_idx, pd.Categorical):
-        group_idx = pd.Categorical(group_idx, np.unique(group_idx))
-    col_idx = group_idx.codes
-    row_idx = np.arange(len(col_idx))
-    data = np.ones(len(row_idx))
-    return sparse.coo_matrix((data, (row_idx, col_idx)),
-                             shape=(len(group_idx), len(group_idx.categories)),
-                             dtype=dtype).tocsr()
+    Rows with missing labels are dropped, as in pandas.
+
+    Returns the grouped csr matrix and the sorted unique group labels.
+    """
+    if by.dtype.kind not in 'biu' and pd.isnull(by).any():
+        valid = np.flatnonzero(pd.notnull(by))
+        group_idx = valid[_group_order(by[valid])]
+    else:
+        group_idx = _group_order(by)
+    sorted_by = by[group_idx]
+    # labels are sorted, so every group starts where the label changes
+    is_start = np.empty(len(sorted_by), dtype=bool)
+    is_start[:1] = True
+    np.not_equal(sorted_by[1:], sorted_by[:-1], out=is_start[1:])
+    group_starts = np.flatnonzero(is_start)
+    labels = sorted_by[group_starts]
+    rows = _take_rows(csr, group_idx)
+    indptr = np.append(rows.indptr[group_starts], rows.indptr[-1])
+    data = rows.data.astype(np.result_type(csr.dtype, 'f8'), copy=False)
+    grouped = sparse.csr_matrix((data, rows.indices, indptr),
+                                shape=(len(labels), csr.shape[1]))
+    grouped.sum_duplicates()
+    grouped.eliminate_zeros()
+    return grouped, labels
 
 
 def sparse_one_hot(df, column=None, categories=None, dtype='f8',
@@ -1214,12 +1443,11 @@ def _one_hot_series_csr(categories, dtype, oh_col,
     if np.any(~mask):
         raise ValueError("Unknown categorical features present "
                          "during transform: %s." % np.unique(oh_col[~mask]))
-    row_indices = np.arange(n_samples, dtype=np.int32)
-    col_indices = codes
-    data = np.ones(row_indices.size)
-    data = sparse.coo_matrix((data, (row_indices, col_indices)),
-                             shape=(n_samples, n_features),
-                             dtype=dtype).tocsr()
+    # exactly one entry per row, so the csr arrays can be set up directly
+    data = sparse.csr_matrix((np.ones(n_samples, dtype=dtype),
+                              codes.astype(np.int32, copy=False),
+                              np.arange(n_samples + 1, dtype=np.int32)),
+                             shape=(n_samples, n_features))
     return cat.categories.values, data
 
 
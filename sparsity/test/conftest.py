@@ -7,28 +7,45 @@ import numpy as np
 import pandas as pd
 import pytest
 
-import sparsity
-# 2017 starts with a sunday
 from sparsity import SparseFrame
 
+_WEEKDAYS = np.array(['Monday', 'Tuesday', 'Wednesday', 'Thursday',
+                      'Friday', 'Saturday', 'Sunday'], dtype=object)
+_WEEKDAYS_ABBR = np.array([day[:3] for day in _WEEKDAYS], dtype=object)
 
-@pytest.fixture()
+
+def repeat_range(k, n):
+    """Return the first n elements of 0, 1, ..., k-1 repeated."""
+    return np.broadcast_to(np.arange(k), (n // k + 1, k)).ravel()[:n]
+
+
+def weekday_names(days, abbr=False):
+    """Day names of integer weekdays, where Monday is 0 as in dt.weekday."""
+    names = _WEEKDAYS_ABBR if abbr else _WEEKDAYS
+    return names[days]
+
+
+@pytest.fixture(scope='module')
 def sampledata():
+    cache = {}
+
     def gendata(n, categorical=False):
-        sample_data = pd.DataFrame(
-            dict(date=pd.date_range("2017-01-01", periods=n)))
-        sample_data["weekday"] = sample_data.date.dt.weekday_name
-        sample_data["weekday_abbr"] = sample_data.weekday.apply(
-            lambda x: x[:3])
+        if (n, categorical) in cache:
+            return cache[(n, categorical)].copy()
+
+        # daily data starting on 2017-01-01, which is a sunday
+        days = (np.arange(n) + 6) % 7
+        sample_data = pd.DataFrame(dict(weekday=weekday_names(days)))
+        sample_data["weekday_abbr"] = weekday_names(days, abbr=True)
 
         if categorical:
             sample_data['weekday'] = sample_data['weekday'].astype('category')
             sample_data['weekday_abbr'] = sample_data['weekday_abbr'] \
                 .astype('category')
 
-        sample_data["id"] = np.tile(np.arange(7), len(sample_data) // 7 + 1)[
-                            :len(sample_data)]
-        return sample_data
+        sample_data["id"] = repeat_range(7, n)
+        cache[(n, categorical)] = sample_data
+        return sample_data.copy()
 
     return gendata
 
@@ -53,9 +70,9 @@ def weekdays_abbr(weekdays):
 
 @pytest.fixture()
 def groupby_frame():
-    shuffle_idx = np.random.permutation(np.arange(100))
-    index = np.tile(np.arange(10), 10)
-    data = np.vstack([np.identity(10) for _ in range(10)])
+    shuffle_idx = np.random.RandomState(0).permutation(100)
+    index = repeat_range(10, 100)
+    data = np.tile(np.identity(10), (10, 1))
     t = SparseFrame(data[shuffle_idx, :], index=index[shuffle_idx])
     return t
 
@@ -82,11 +99,6 @@ def sf_midx_int():
     return sf
 
 
-@pytest.fixture()
-def testdb():
-    return os.path.join(sparsity.__path__[0], 'test/tiny.tdb')
-
-
 @pytest.fixture()
 def clickstream():
     df = pd.DataFrame(
@@ -100,28 +112,35 @@ def clickstream():
     return df
 
 
-@pytest.fixture()
-def complex_example():
+@pytest.fixture(scope='module')
+def complex_example_dense():
+    """Dense data of the complex_example frames in index order."""
     first = np.identity(10)
-    second = np.zeros((4, 10))
-    third = np.zeros((4, 10))
+    second = np.zeros((4, 10), dtype=np.int8)
+    third = np.zeros((4, 10), dtype=np.int8)
     second[[0, 1, 2, 3], [2, 3, 4, 5]] = 10
     third[[0, 1, 2, 3], [6, 7, 8, 9]] = 20
+    for data in (first, second, third):
+        data.setflags(write=False)
+    return first, second, third
+
+
+@pytest.fixture(scope='module')
+def complex_example(complex_example_dense):
+    rng = np.random.RandomState(0)
+    first, second, third = complex_example_dense
 
-    shuffle_idx = np.arange(10)
-    np.random.shuffle(shuffle_idx)
+    shuffle_idx = rng.permutation(10)
 
     first = SparseFrame(first[shuffle_idx],
                         index=np.arange(10)[shuffle_idx])
 
-    shuffle_idx = np.arange(4)
-    np.random.shuffle(shuffle_idx)
+    shuffle_idx = rng.permutation(4)
 
     second = SparseFrame(second[shuffle_idx],
                          index=np.arange(2, 6)[shuffle_idx])
 
-    shuffle_idx = np.arange(4)
-    np.random.shuffle(shuffle_idx)
+    shuffle_idx = rng.permutation(4)
 
     third = SparseFrame(third[shuffle_idx],
                         index=np.arange(6, 10)[shuffle_idx])
@@ -143,3 +162,18 @@ def tmpdir(dir=None):
 def sf_arange():
     return SparseFrame(np.tile(np.arange(1, 11)[:, np.newaxis], (1, 3)),
                        columns=list('ABC'))
+
+
+@pytest.fixture(scope='session')
+def identity_frames():
+    return {n: SparseFrame(np.identity(n, dtype=np.int8)) for n in (5, 10)}
+
+
+@pytest.fixture()
+def sf5(identity_frames):
+    return identity_frames[5].copy(deep=False)
+
+
+@pytest.fixture()
+def sf10(identity_frames):
+    return identity_frames[10].copy(deep=False)
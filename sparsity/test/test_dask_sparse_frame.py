@@ -13,6 +13,7 @@ from distributed import Client
 
 import sparsity as sp
 import sparsity.dask as dsp
+from sparsity.dask.core import apply_and_enforce
 from sparsity.dask.reshape import one_hot_encode
 from .conftest import tmpdir
 
@@ -40,6 +41,14 @@ def test_from_pandas():
     assert res.shape == (10,2)
 
 
+def test_unknown_divisions(dsf):
+    res = dsp.SparseFrame(dict(dsf.dask), dsf._name, dsf._meta)
+    assert res.npartitions == dsf.npartitions
+    assert res.divisions == (None,) * (dsf.npartitions + 1)
+    assert res.__dask_keys__() == dsf.__dask_keys__()
+    assert res.compute().shape == (10, 2)
+
+
 def test_map_partitions():
     data = pd.DataFrame(np.random.rand(10, 2))
     dsf = dsp.from_pandas(data,
@@ -68,6 +77,21 @@ def test_map_partitions_mappable():
     assert (res.iloc[5:, :] == 6).all().all()
 
 
+def test_map_partitions_different_frames():
+    dsf = dsp.from_pandas(pd.DataFrame(np.ones((10, 2))), chunksize=5)
+    dsf2 = dsp.from_pandas(pd.DataFrame(np.zeros((10, 2))), chunksize=5)
+
+    def foo(sf):
+        return sf
+
+    res = dsf.map_partitions(foo, dsf._meta)
+    res2 = dsf2.map_partitions(foo, dsf._meta)
+
+    assert res._name != res2._name
+    assert (res.compute().todense() == 1).all().all()
+    assert (res2.compute().todense() == 0).all().all()
+
+
 def test_todense():
     data = pd.DataFrame(np.random.rand(10, 2))
     dsf = dsp.from_pandas(data, npartitions=3)
@@ -472,6 +496,31 @@ def test_add():
     pdt.assert_frame_equal(res, correct)
 
 
+@pytest.mark.parametrize('chunksize2', [4, 5])
+def test_add_divisions(chunksize2):
+    df = pd.DataFrame(np.identity(12))
+    df2 = pd.DataFrame(np.ones((12, 12)))
+    correct = sp.SparseFrame(df).add(sp.SparseFrame(df2)).todense()
+
+    dsf = dsp.from_pandas(df, chunksize=4)
+    dsf2 = dsp.from_pandas(df2, chunksize=chunksize2)
+    assert dsf._name != dsf2._name
+    assert (dsf.divisions == dsf2.divisions) == (chunksize2 == 4)
+
+    res = dsf.add(dsf2)
+    pdt.assert_frame_equal(res.compute().todense(), correct)
+
+
+def test_add_same_frame():
+    df = pd.DataFrame(np.identity(12))
+    dsf = dsp.from_pandas(df, chunksize=4)
+
+    res = dsf.add(dsf)
+    assert res.divisions == dsf.divisions
+    pdt.assert_frame_equal(res.compute().todense(),
+                           sp.SparseFrame(df * 2).todense())
+
+
 @pytest.mark.parametrize('idx', [
     np.random.choice([uuid4() for i in range(1000)], size=10000),
     np.random.randint(0, 10000, 10000),
@@ -709,3 +758,18 @@ def test_random_split_(dsf_arange, sf_arange):
 def test_random_split_error(dsf_arange):
     with pytest.raises(ValueError):
         dsf_arange.random_split(frac=[0.8, 0.3])
+
+
+@pytest.mark.parametrize('meta_cols, cols', [
+    (pd.Index([0, 1]), pd.Index([0., 1.])),
+    (pd.MultiIndex.from_tuples([('a', 1), ('b', 2)]),
+     pd.Index([('a', 1), ('b', 2)], tupleize_cols=False)),
+    (pd.CategoricalIndex(['a', 'b']), pd.Index(['a', 'b'])),
+    (pd.RangeIndex(2), pd.Index([0, 1])),
+])
+def test_apply_and_enforce_column_type(meta_cols, cols):
+    meta = sp.SparseFrame(np.ones((2, 2)), columns=meta_cols)
+    sf = sp.SparseFrame(np.ones((2, 2)), columns=cols)
+    res = apply_and_enforce(lambda x: x, sf, {}, meta)
+    assert type(res.columns) is type(meta.columns)
+    assert res.columns.equals(meta.columns)
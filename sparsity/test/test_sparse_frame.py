@@ -1,6 +1,8 @@
 # coding=utf-8
+import copy
 import datetime as dt
 import os
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 
 import numpy as np
@@ -12,7 +14,18 @@ from scipy import sparse
 
 from sparsity import SparseFrame, sparse_one_hot
 from sparsity.io_ import _csr_to_dict
-from .conftest import tmpdir
+from .conftest import repeat_range, tmpdir, weekday_names
+
+_I5 = np.identity(5, dtype=np.int8)
+_I5.setflags(write=False)
+_I10 = np.identity(10, dtype=np.int8)
+_I10.setflags(write=False)
+
+
+def _sparse_equal(csr, dense):
+    """Compare a csr matrix to a (dense) reference without densifying it."""
+    ref = sparse.csr_matrix(dense)
+    return csr.shape == ref.shape and (csr != ref).nnz == 0
 
 
 @contextmanager
@@ -58,6 +71,17 @@ def test_empty_init():
     assert sf.data.shape == (2, 0)
 
 
+def test_init_int32_indices():
+    csr = sparse.csr_matrix(np.identity(5))
+    csr.indices = csr.indices.astype(np.int64)
+    csr.indptr = csr.indptr.astype(np.int64)
+    sf = SparseFrame(csr)
+    assert sf.data.indices.dtype == np.int32
+    assert sf.data.indptr.dtype == np.int32
+    assert csr.indices.dtype == np.int64
+    assert np.all(sf.data.toarray() == np.identity(5))
+
+
 def test_empty_column_access():
     sf = SparseFrame(np.array([]), index=[], columns=['A', 'B', 'C', 'D'])
     assert sf['D'].data.shape == (0, 1)
@@ -65,78 +89,103 @@ def test_empty_column_access():
 
 def test_groupby(groupby_frame):
     t = groupby_frame
-    res = t.groupby_sum().data.todense()
-    assert np.all(res == (np.identity(10) * 10))
+    res = t.groupby_sum().data
+    assert _sparse_equal(res, _I10 * 10)
 
 
 def test_groupby_dense_random_data():
-    shuffle_idx = np.random.permutation(np.arange(100))
-    index = np.tile(np.arange(10), 10)
-    single_tile = np.random.rand(10, 10)
-    data = np.vstack([single_tile for _ in range(10)])
+    rng = np.random.RandomState(0)
+    shuffle_idx = rng.permutation(100)
+    index = repeat_range(10, 100)
+    single_tile = rng.rand(10, 10)
+    data = np.tile(single_tile, (10, 1))
     t = SparseFrame(data[shuffle_idx, :], index=index[shuffle_idx])
-    res = t.groupby_sum().data.todense()
+    res = t.groupby_sum().data.toarray()
     np.testing.assert_array_almost_equal(res, (single_tile * 10))
 
 
-def test_simple_join():
-    t = SparseFrame(np.identity(10))
+@pytest.mark.parametrize('labels', [
+    np.array([-3, 2, -3, 0, 2], dtype=np.int8),
+    np.array([2 ** 40, 0, 2 ** 40, -1, 0]),
+    np.array(list('bcbac'), dtype=object),
+])
+def test_groupby_sum_labels(labels):
+    data = np.arange(10).reshape(5, 2)
+    sf = SparseFrame(data, index=labels)
+    res = sf.groupby_sum()
+    correct_index = np.unique(labels)
+    correct = np.vstack([data[labels == label].sum(axis=0)
+                         for label in correct_index])
+    assert np.all(res.index.values == correct_index)
+    assert _sparse_equal(res.data, correct)
+
 
-    res1 = t.join(t, axis=0).data.todense()
-    correct = np.vstack([np.identity(10), np.identity(10)])
-    assert np.all(res1 == correct)
+def test_groupby_sum_missing_labels():
+    sf = SparseFrame(np.identity(4), index=[1.0, np.nan, 0.0, np.nan])
+    res = sf.groupby_sum()
+    assert res.index.tolist() == [0.0, 1.0]
+    assert _sparse_equal(res.data, np.identity(4)[[2, 0]])
 
-    res2 = t.join(t, axis=1).data.todense()
-    correct = np.hstack([np.identity(10), np.identity(10)])
-    assert np.all(res2 == correct)
 
+@pytest.mark.parametrize('axis', [0, 1])
+def test_simple_join(sf10, axis):
+    res = sf10.join(sf10, axis=axis).data
+    correct = np.concatenate([_I10, _I10], axis=axis)
+    assert _sparse_equal(res, correct)
 
-def test_complex_join(complex_example):
+
+def test_complex_join(complex_example, complex_example_dense):
     first, second, third = complex_example
-    correct = pd.DataFrame(first.data.todense(),
-                           index=first.index,
-                           columns=map(str, range(len(first.columns)))) \
-        .join(pd.DataFrame(second.data.todense(),
-                           index=second.index,
-                           columns=map(str, range(len(second.columns)))),
-              how='left',
-              rsuffix='_second') \
-        .join(pd.DataFrame(third.data.todense(),
-                           index=third.index,
-                           columns=map(str, range(len(third.columns)))),
-              how='left',
-              rsuffix='_third') \
-        .sort_index().fillna(0)
+    first_dense, second_dense, third_dense = complex_example_dense
+    # second and third hold the rows labelled 2-5 and 6-9 respectively
+    correct = np.zeros((10, 30))
+    correct[:, :10] = first_dense
+    correct[2:6, 10:20] = second_dense
+    correct[6:, 20:] = third_dense
 
     res = first.join(second, axis=1).join(third, axis=1) \
-        .sort_index().data.todense()
-    assert np.all(correct.values == res)
-
-    # res = right.join(left, axis=1).data.todense()
-    # assert np.all(correct == res)
+        .sort_index().data
+    assert _sparse_equal(res, correct)
 
 
 def test_mutually_exclusive_join():
-    correct = np.vstack([np.hstack([np.identity(5), np.zeros((5, 5))]),
-                         np.hstack([np.zeros((5, 5)), np.identity(5)])])
+    correct = np.zeros((10, 10))
+    correct[:5, :5] = _I5
+    correct[5:, 5:] = _I5
 
-    left_ax1 = SparseFrame(np.identity(5), index=np.arange(5))
-    right_ax1 = SparseFrame(np.identity(5), index=np.arange(5, 10))
+    left_ax1 = SparseFrame(_I5, index=np.arange(5))
+    right_ax1 = SparseFrame(_I5, index=np.arange(5, 10))
 
     res_ax1 = left_ax1.join(right_ax1, axis=1)
 
-    left_ax0 = SparseFrame(np.identity(5), columns=np.arange(5))
-    right_ax0 = SparseFrame(np.identity(5), columns=np.arange(5, 10))
+    left_ax0 = SparseFrame(_I5, columns=np.arange(5))
+    right_ax0 = SparseFrame(_I5, columns=np.arange(5, 10))
 
     res_ax0 = left_ax0.join(right_ax0, axis=0)
-    assert np.all(res_ax0.data.todense() == correct), \
+    assert _sparse_equal(res_ax0.data, correct), \
         "Joining along axis 0 failed."
 
-    assert np.all(res_ax1.data.todense() == correct), \
+    assert _sparse_equal(res_ax1.data, correct), \
         "Joining along axis 1 failed."
 
+
+def test_concat_many():
+    sfs = [SparseFrame(np.identity(3) * i, index=np.arange(3) + 3 * i,
+                       columns=list('ABC'))
+           for i in range(5)]
+    res = SparseFrame.concat(sfs)
+    assert np.all(res.index == np.arange(15))
+    correct = np.vstack([np.identity(3) * i for i in range(5)])
+    assert np.all(res.data.toarray() == correct)
+
+    res = SparseFrame.concat(sfs, axis=1)
+    assert res.shape == (15, 15)
+    assert np.all(res.data.toarray() == sparse.block_diag(
+        [np.identity(3) * i for i in range(5)]).toarray())
+
+
 def test__array___():
-    correct = np.identity(5)
+    correct = _I5
     sf = SparseFrame(correct, index=list('ABCDE'),
                      columns=list('ABCDE'))
     res = np.asarray(sf)
@@ -147,44 +196,39 @@ def test__array___():
     assert len(res.shape) == 1
 
 
-def test_iloc():
+@pytest.mark.parametrize('key', [slice(None, 2), [3, 4], 3, slice(1, None)])
+def test_iloc(key):
     # name index and columns somehow so that their names are not integers
-    sf = SparseFrame(np.identity(5), index=list('ABCDE'),
+    sf = SparseFrame(_I5, index=list('ABCDE'),
                      columns=list('ABCDE'))
 
-    assert np.all(sf.iloc[:2].data.todense() == np.identity(5)[:2])
-    assert np.all(sf.iloc[[3, 4]].data.todense() == np.identity(5)[[3, 4]])
-    assert np.all(sf.iloc[3].data.todense() == np.identity(5)[3])
-    assert sf.iloc[1:].shape == (4, 5)
+    assert _sparse_equal(sf.iloc[key].data, _I5[key])
 
 
 def test_loc():
-    sf = SparseFrame(np.identity(5), index=list("ABCDE"))
+    sf = SparseFrame(_I5, index=list("ABCDE"))
 
     # test single
-    assert np.all(sf.loc['A'].data.todense() == np.matrix([[1, 0, 0, 0, 0]]))
+    assert _sparse_equal(sf.loc['A'].data, np.matrix([[1, 0, 0, 0, 0]]))
 
     # test slices
-    assert np.all(sf.loc[:'B'].data.todense() == np.identity(5)[:2])
+    assert _sparse_equal(sf.loc[:'B'].data, _I5[:2])
 
     # test all
-    assert np.all(sf.loc[list("ABCDE")].data.todense() == np.identity(5))
-    assert np.all(sf.loc[:, :].data.todense() == np.identity(5))
-    assert np.all(sf.loc[:].data.todense() == np.identity(5))
+    assert _sparse_equal(sf.loc[list("ABCDE")].data, _I5)
+    assert _sparse_equal(sf.loc[:, :].data, _I5)
+    assert _sparse_equal(sf.loc[:].data, _I5)
 
-    sf = SparseFrame(np.identity(5), pd.date_range("2016-10-01", periods=5))
+    sf = SparseFrame(_I5, pd.date_range("2016-10-01", periods=5))
 
     str_slice = slice('2016-10-01',"2016-10-03")
-    assert np.all(sf.loc[str_slice].data.todense() ==
-                  np.identity(5)[:3])
+    assert _sparse_equal(sf.loc[str_slice].data, _I5[:3])
 
     ts_slice = slice(pd.Timestamp('2016-10-01'),pd.Timestamp("2016-10-03"))
-    assert np.all(sf.loc[ts_slice].data.todense() ==
-                  np.identity(5)[:3])
+    assert _sparse_equal(sf.loc[ts_slice].data, _I5[:3])
 
     dt_slice = slice(dt.date(2016,10,1), dt.date(2016,10,3))
-    assert np.all(sf.loc[dt_slice].data.todense() ==
-                  np.identity(5)[:3])
+    assert _sparse_equal(sf.loc[dt_slice].data, _I5[:3])
 
 
 def test_loc_multi_index(sf_midx, sf_midx_int):
@@ -192,16 +236,16 @@ def test_loc_multi_index(sf_midx, sf_midx_int):
     assert sf_midx.loc['2016-10-01'].data[0, 0] == 1
 
     str_slice = slice('2016-10-01', "2016-10-03")
-    assert np.all(sf_midx.loc[str_slice].data.todense() ==
-                  np.identity(5)[:3])
+    assert np.all(sf_midx.loc[str_slice].data.toarray() ==
+                  _I5[:3])
 
     ts_slice = slice(pd.Timestamp('2016-10-01'), pd.Timestamp("2016-10-03"))
-    assert np.all(sf_midx.loc[ts_slice].data.todense() ==
-                  np.identity(5)[:3])
+    assert np.all(sf_midx.loc[ts_slice].data.toarray() ==
+                  _I5[:3])
 
     dt_slice = slice(dt.date(2016, 10, 1), dt.date(2016, 10, 3))
-    assert np.all(sf_midx.loc[dt_slice].data.todense() ==
-                  np.identity(5)[:3])
+    assert np.all(sf_midx.loc[dt_slice].data.toarray() ==
+                  _I5[:3])
 
     assert np.all(sf_midx_int.loc[1].todense().values == sf_midx.data[:4,:])
     assert np.all(sf_midx_int.loc[0].todense().values == sf_midx.data[4, :])
@@ -219,15 +263,13 @@ def test_set_index(sf_midx):
     assert np.all(sf.index.values == np.arange(5))
 
     # what if indices are actually ints, but don't start from 0?
-    sf = SparseFrame(np.identity(5), index=[1, 2, 3, 4, 5])
+    sf = SparseFrame(_I5, index=[1, 2, 3, 4, 5])
 
     # test single
-    assert np.all(sf.loc[1].data.todense() == np.matrix([[1, 0, 0, 0, 0]]))
+    assert np.all(sf.loc[1].data.toarray() == np.matrix([[1, 0, 0, 0, 0]]))
 
     # test slices
-    assert np.all(sf.loc[:2].data.todense() == np.identity(5)[:2])
-
-    # assert np.all(sf.loc[[4, 5]].data.todense() == np.identity(5)[[3, 4]])
+    assert np.all(sf.loc[:2].data.toarray() == _I5[:2])
 
 
 def test_save_load_multiindex(sf_midx):
@@ -250,66 +292,130 @@ def test_save_load_multiindex(sf_midx):
         assert isinstance(res.index, pd.MultiIndex)
 
 
-def test_new_column_assign_array():
-    sf = SparseFrame(np.identity(5))
+def test_new_column_assign_array(sf5):
+    sf = sf5
     sf[6] = np.ones(5)
-    correct = np.hstack([np.identity(5), np.ones(5).reshape(-1, 1)])
+    correct = np.hstack([_I5, np.ones(5).reshape(-1, 1)])
     assert sf.shape == (5, 6)
-    assert np.all(correct == sf.data.todense())
+    assert _sparse_equal(sf.data, correct)
 
 
-def test_new_column_assign_number():
-    sf = SparseFrame(np.identity(5))
+def test_new_column_assign_number(sf5):
+    sf = sf5
     sf[6] = 1
-    correct = np.hstack([np.identity(5), np.ones(5).reshape(-1, 1)])
+    correct = np.hstack([_I5, np.ones(5).reshape(-1, 1)])
+    assert sf.shape == (5, 6)
+    assert _sparse_equal(sf.data, correct)
+
+
+def test_new_column_assign_multiple(sf5):
+    sf = sf5
+    sf[5] = np.arange(5)
+    sf[6] = 2
+    assert sf.shape == (5, 7)
+    assert sf.columns.tolist() == list(range(7))
+    correct = np.hstack([_I5, np.arange(5).reshape(-1, 1),
+                         np.full((5, 1), 2)])
+    assert _sparse_equal(sf.data, correct)
+
+
+def test_new_column_assign_invalid(sf5):
+    sf = sf5
+    with pytest.raises((TypeError, ValueError)):
+        sf[5] = 'x'
+    assert sf.shape == (5, 5)
+    assert sf.columns.tolist() == list(range(5))
+    assert _sparse_equal(sf.data, _I5)
+
+
+def test_new_column_assign_shallow_copy(sf5):
+    sf = sf5
+    sf[5] = 1
+    other = copy.copy(sf)
+    other[6] = 2
     assert sf.shape == (5, 6)
-    assert np.all(correct == sf.data.todense())
+    assert sf.data.shape == (5, 6)
+    assert other.data.shape == (5, 7)
+
+
+def test_new_column_concurrent_read():
+    for _ in range(20):
+        sf = SparseFrame(np.identity(50))
+        for i in range(50, 60):
+            sf[i] = i
+        with ThreadPoolExecutor(4) as executor:
+            shapes = list(executor.map(lambda _: sf.data.shape, range(8)))
+        assert set(shapes) == {(50, 60)}
+        assert sf.data.shape == sf.shape
+
 
 def test_assign_array():
-    sf = SparseFrame(np.identity(5), columns=list('ABCDE'))
+    sf = SparseFrame(_I5, columns=list('ABCDE'))
     sf = sf.assign(**{'F': np.ones(5)})
-    correct = np.hstack([np.identity(5), np.ones(5).reshape(-1, 1)])
+    correct = np.hstack([_I5, np.ones(5).reshape(-1, 1)])
     assert 'F' in set(sf.columns)
     assert sf.shape == (5, 6)
-    assert np.all(correct == sf.data.todense())
+    assert _sparse_equal(sf.data, correct)
 
 
 def test_assign_number():
-    sf = SparseFrame(np.identity(5), columns=list('ABCDE'))
+    sf = SparseFrame(_I5, columns=list('ABCDE'))
     sf = sf.assign(**{'F': 1})
-    correct = np.hstack([np.identity(5), np.ones(5).reshape(-1, 1)])
+    correct = np.hstack([_I5, np.ones(5).reshape(-1, 1)])
     assert 'F' in set(sf.columns)
     assert sf.shape == (5, 6)
-    assert np.all(correct == sf.data.todense())
+    assert _sparse_equal(sf.data, correct)
 
 
-def test_existing_column_assign_array():
-    sf = SparseFrame(np.identity(5))
+def test_existing_column_assign_array(sf5):
+    sf = sf5
     with pytest.raises(NotImplementedError):
         sf[0] = np.ones(5)
         correct = np.identity(5)
         correct[:, 0] = 1
-        assert np.all(correct == sf.data.todense())
+        assert np.all(correct == sf.data.toarray())
 
 
-def test_existing_column_assign_number():
-    sf = SparseFrame(np.identity(5))
+def test_existing_column_assign_number(sf5):
+    sf = sf5
     with pytest.raises(NotImplementedError):
         sf[0] = 1
         correct = np.identity(5)
         correct[:, 0] = 1
-        assert np.all(correct == sf.data.todense())
+        assert np.all(correct == sf.data.toarray())
+
+
+def test_existing_column_assign_after_new_column(sf5):
+    sf = sf5
+    sf[5] = 1
+    with pytest.raises(NotImplementedError):
+        sf[5] = 2
+    with pytest.raises(NotImplementedError):
+        sf[0] = 2
+    assert sf.columns.tolist() == list(range(6))
+
+
+def test_new_column_assign_datetime_columns():
+    sf = SparseFrame(np.identity(3),
+                     columns=pd.date_range('2020', periods=3))
+    sf[pd.Timestamp('2021')] = 1
+    assert sf.columns.tolist() == \
+        list(pd.date_range('2020', periods=3)) + [pd.Timestamp('2021')]
+    with pytest.raises(NotImplementedError):
+        sf['2020-01-01'] = 1
+    assert sf.shape == (3, 4)
 
 
-def test_add_total_overlap(complex_example):
+def test_add_total_overlap(complex_example, complex_example_dense):
     first, second, third = complex_example
-    correct = first.sort_index().data.todense()
-    correct[2:6, :] += second.sort_index().data.todense()
-    correct[6:, :] += third.sort_index().data.todense()
+    first_dense, second_dense, third_dense = complex_example_dense
+    # second and third cover the rows 2-5 and 6-9 of first
+    correct = sparse.csr_matrix(first_dense) + sparse.vstack(
+        [sparse.csr_matrix((2, 10)), second_dense, third_dense], format='csr')
 
     res = first.add(second).add(third).sort_index()
 
-    assert np.all(res.data.todense() == correct)
+    assert _sparse_equal(res.data, correct)
 
 
 def test_simple_add_partial_overlap(complex_example):
@@ -320,37 +426,71 @@ def test_simple_add_partial_overlap(complex_example):
     correct[2, :] += 1
 
     res = first.add(second)
-    assert np.all(res.data.todense() == correct)
+    assert _sparse_equal(res.data, correct)
     assert np.all(res.index == range(5))
 
 
-def test_add_partial_overlap(complex_example):
+def test_add_partial_overlap(complex_example, complex_example_dense):
     first, second, third = complex_example
+    first_dense, second_dense, third_dense = complex_example_dense
     third = third.sort_index()
     third._index = np.arange(8, 12)
 
-    correct = first.sort_index().data.todense()
-    correct[2:6, :] += second.sort_index().data.todense()
-    correct[8:, :] += third.sort_index().data.todense()[:2, :]
-    correct = np.vstack((correct, third.sort_index().data.todense()[2:, :]))
+    correct = np.zeros((12, 10))
+    correct[:10] = first_dense
+    correct[2:6] += second_dense
+    correct[8:] += third_dense
 
     res = first.add(second).add(third).sort_index()
 
-    assert np.all(res.data.todense() == correct)
+    assert _sparse_equal(res.data, correct)
 
 
-def test_add_no_overlap(complex_example):
+def test_add_no_overlap(complex_example, complex_example_dense):
     first, second, third = complex_example
+    first_dense, second_dense, third_dense = complex_example_dense
     third = third.sort_index()
     third._index = np.arange(10, 14)
 
-    correct = first.sort_index().data.todense()
-    correct[2:6, :] += second.sort_index().data.todense()
-    correct = np.vstack((correct, third.sort_index().data.todense()))
+    correct = np.zeros((14, 10))
+    correct[:10] = first_dense
+    correct[2:6] += second_dense
+    correct[10:] = third_dense
 
     res = first.add(second).add(third).sort_index()
 
-    assert np.all(res.data.todense() == correct)
+    assert _sparse_equal(res.data, correct)
+
+
+@pytest.mark.parametrize('how, correct_index', [
+    ('outer', [0, 1, 2, 3, 4]),
+    ('inner', [1, 3]),
+    ('left', [0, 1, 2, 3, 4]),
+    ('right', [1, 3]),
+])
+def test_add_sorted_subset(how, correct_index):
+    first = SparseFrame(np.identity(5), index=np.arange(5))
+    second = SparseFrame(np.ones((2, 5)), index=[1, 3])
+
+    correct = np.identity(5)
+    correct[[1, 3], :] += 1
+
+    res = first.add(second, how=how)
+    assert res.index.tolist() == correct_index
+    assert np.all(res.data.toarray() == correct[correct_index])
+
+    res = second.add(first, how=how)
+    assert res.index.tolist() == {'left': [1, 3],
+                                  'right': [0, 1, 2, 3, 4]}.get(how,
+                                                                correct_index)
+    assert np.all(res.data.toarray() == correct[res.index.tolist()])
+
+
+def test_add_self_duplicate_index():
+    sf = SparseFrame(np.ones((3, 2)), index=[1, 1, 0])
+    res = sf.add(sf)
+    assert res.shape == (5, 2)
+    assert res.shape == sf.add(sf.copy()).shape
 
 
 def test_csr_one_hot_series_disk_categories(sampledata):
@@ -361,7 +501,7 @@ def test_csr_one_hot_series_disk_categories(sampledata):
         pd.Series(categories).to_pickle(cat_path)
         sparse_frame = sparse_one_hot(sampledata(49),
                                       categories={'weekday': cat_path})
-        res = sparse_frame.groupby_sum(np.tile(np.arange(7), 7)).data.todense()
+        res = sparse_frame.groupby_sum(repeat_range(7, 49)).data.toarray()
         assert np.all(res == np.identity(7) * 7)
 
 
@@ -369,7 +509,7 @@ def test_csr_one_hot_series_legacy(sampledata):
     categories = ['Sunday', 'Monday', 'Tuesday', 'Wednesday',
                   'Thursday', 'Friday', 'Saturday']
     sparse_frame = sparse_one_hot(sampledata(49), 'weekday', categories)
-    res = sparse_frame.groupby_sum(np.tile(np.arange(7), 7)).data.todense()
+    res = sparse_frame.groupby_sum(repeat_range(7, 49)).data.toarray()
     assert np.all(res == np.identity(7) * 7)
 
 
@@ -383,8 +523,8 @@ def test_csr_one_hot_series(sampledata, weekdays, weekdays_abbr):
     sparse_frame = sparse_one_hot(sampledata(49), categories=categories,
                                   order=['weekday', 'weekday_abbr'])
 
-    res = sparse_frame.groupby_sum(np.tile(np.arange(7), 7)).data.todense()
-    assert np.all(res == correct)
+    res = sparse_frame.groupby_sum(repeat_range(7, 49)).data
+    assert _sparse_equal(res, correct)
     assert all(sparse_frame.columns == (weekdays + weekdays_abbr))
 
 
@@ -403,7 +543,7 @@ def test_csr_one_hot_series_categorical_same_order(sampledata, weekdays,
                                   order=['weekday', 'weekday_abbr'],
                                   ignore_cat_order_mismatch=False)
 
-    res = sparse_frame.groupby_sum(np.tile(np.arange(7), 7)) \
+    res = sparse_frame.groupby_sum(repeat_range(7, 49)) \
         .todense()[weekdays + weekdays_abbr].values
     assert np.all(res == correct)
     assert set(sparse_frame.columns) == set(weekdays + weekdays_abbr)
@@ -446,7 +586,7 @@ def test_csr_one_hot_series_categorical_different_order_ignore(
                                   order=['weekday', 'weekday_abbr'],
                                   ignore_cat_order_mismatch=True)
 
-    res = sparse_frame.groupby_sum(np.tile(np.arange(7), 7)) \
+    res = sparse_frame.groupby_sum(repeat_range(7, 49)) \
         .todense()[weekdays + weekdays_abbr].values
     assert np.all(res == correct)
     assert set(sparse_frame.columns) == set(weekdays + weekdays_abbr)
@@ -470,7 +610,7 @@ def test_csr_one_hot_series_categorical_no_categories(
                                   order=['weekday', 'weekday_abbr'],
                                   ignore_cat_order_mismatch=True)
 
-    res = sparse_frame.groupby_sum(np.tile(np.arange(7), 7)) \
+    res = sparse_frame.groupby_sum(repeat_range(7, 49)) \
         .todense()[weekdays + weekdays_abbr].values
     assert np.all(res == correct)
     assert set(sparse_frame.columns) == set(weekdays + weekdays_abbr)
@@ -489,7 +629,7 @@ def test_csr_one_hot_series_other_order(sampledata, weekdays, weekdays_abbr):
 
 def test_csr_one_hot_series_no_categories(sampledata, weekdays, weekdays_abbr):
 
-    data = sampledata(49, categorical=True).drop('date', axis=1)
+    data = sampledata(49, categorical=True)
     sparse_frame = sparse_one_hot(data)
 
     assert set(sparse_frame.columns) \
@@ -530,7 +670,7 @@ def test_csr_one_hot_series_prefixes(sampledata, weekdays, weekdays_abbr):
                                   order=['weekday', 'weekday_abbr'],
                                   prefixes=True)
 
-    res = sparse_frame.groupby_sum(np.tile(np.arange(7), 7)).data.todense()
+    res = sparse_frame.groupby_sum(repeat_range(7, 49)).data.toarray()
     assert np.all(res == correct)
     correct_columns = list(map(lambda x: 'weekday_' + x, weekdays)) \
         + list(map(lambda x: 'weekday_abbr_' + x, weekdays_abbr))
@@ -551,10 +691,9 @@ def test_csr_one_hot_series_prefixes_sep(sampledata, weekdays, weekdays_abbr):
 
 
 def test_csr_one_hot_series_same_categories(weekdays):
-    sample_data = pd.DataFrame(
-        dict(date=pd.date_range("2017-01-01", periods=7)))
-    sample_data["weekday"] = sample_data.date.dt.weekday_name
-    sample_data["weekday2"] = sample_data.date.dt.weekday_name
+    days = (np.arange(7) + 6) % 7
+    sample_data = pd.DataFrame(dict(weekday=weekday_names(days)))
+    sample_data["weekday2"] = weekday_names(days)
 
     categories = {'weekday': weekdays,
                   'weekday2': weekdays}
@@ -577,7 +716,7 @@ def test_csr_one_hot_series_too_much_categories(sampledata):
                   'Thursday', 'Friday', 'Yesterday', 'Saturday', 'Birthday']
     sparse_frame = sparse_one_hot(sampledata(49),
                                   categories={'weekday': categories})
-    res = sparse_frame.groupby_sum(np.tile(np.arange(7), 7)).data.todense()
+    res = sparse_frame.groupby_sum(repeat_range(7, 49)).data.toarray()
 
     correct = np.identity(7) * 7
     correct = np.hstack((correct[:,:6], np.zeros((7, 1)),
@@ -608,7 +747,7 @@ def test_csr_one_hot_series_dense_column(sampledata, weekdays, weekdays_abbr):
 
     sparse_frame = sparse_one_hot(data, categories=categories)
 
-    res = sparse_frame.groupby_sum(np.tile(np.arange(7), 7)).todense()
+    res = sparse_frame.groupby_sum(repeat_range(7, 49)).todense()
     assert set(sparse_frame.columns) \
         == set(weekdays + weekdays_abbr + ['dense'])
     assert np.all(res[weekdays + weekdays_abbr] == correct_without_dense)
@@ -635,7 +774,7 @@ def test_npz_io(complex_example):
     sf, second, third = complex_example
     sf.to_npz('/tmp/sparse.npz')
     loaded = SparseFrame.read_npz('/tmp/sparse.npz')
-    assert np.all(loaded.data.todense() == sf.data.todense())
+    assert np.all(loaded.data.toarray() == sf.data.toarray())
     assert np.all(loaded.index == sf.index)
     assert np.all(loaded.columns == sf.columns)
     os.remove('/tmp/sparse.npz')
@@ -646,7 +785,7 @@ def test_npz_io_s3(complex_example):
         sf, second, third = complex_example
         sf.to_npz('s3://sparsity/sparse.npz')
         loaded = SparseFrame.read_npz('s3://sparsity/sparse.npz')
-        assert np.all(loaded.data.todense() == sf.data.todense())
+        assert np.all(loaded.data.toarray() == sf.data.toarray())
         assert np.all(loaded.index == sf.index)
         assert np.all(loaded.columns == sf.columns)
 
@@ -656,13 +795,13 @@ def test_getitem():
     id_ = np.identity(10)
     sf = SparseFrame(id_, columns=list('abcdefghij'))
 
-    assert sf['a'].data.todense()[0] == 1
-    assert sf['j'].data.todense()[9] == 1
-    assert np.all(sf[['a', 'b']].data.todense() == np.asmatrix(id_[:, [0, 1]]))
-    tmp = sf[['j', 'a']].data.todense()
+    assert sf['a'].data.toarray()[0] == 1
+    assert sf['j'].data.toarray()[9] == 1
+    assert np.all(sf[['a', 'b']].data.toarray() == np.asmatrix(id_[:, [0, 1]]))
+    tmp = sf[['j', 'a']].data.toarray()
     assert tmp[9, 0] == 1
     assert tmp[0, 1] == 1
-    assert (sf[list('abcdefghij')].data.todense() == np.identity(10)).all()
+    assert (sf[list('abcdefghij')].data.toarray() == np.identity(10)).all()
     assert sf[[]].shape == (10, 0)
     assert len(sf[[]].columns) == 0
     assert isinstance(sf.columns, type(sf[[]].columns))
@@ -726,7 +865,7 @@ def test_vstack():
                          columns=list('ABCDE'))
         frames.append(sf)
     sf = SparseFrame.vstack(frames)
-    assert np.all(sf.data.todense() == np.vstack(data))
+    assert np.all(sf.data.toarray() == np.vstack(data))
 
     with pytest.raises(AssertionError):
         frames[2] = SparseFrame(np.identity(5),
@@ -747,8 +886,8 @@ def test_vstack_multi_index(clickstream):
     assert isinstance(res.index, pd.MultiIndex)
 
 
-def test_boolean_indexing():
-    sf = SparseFrame(np.identity(5))
+def test_boolean_indexing(sf5):
+    sf = sf5
     res = sf.loc[sf.index > 2]
     assert isinstance(res, SparseFrame)
     assert res.shape == (2, 5)
@@ -779,18 +918,18 @@ def test_dropna():
     correct = np.zeros((3, 5))
     correct[[0, 1, 2], [0, 2, 4]] = 1
 
-    assert np.all(sf_cleared.data.todense() == correct)
+    assert np.all(sf_cleared.data.toarray() == correct)
 
 
 def test_drop_duplicate_idx():
     sf = SparseFrame(np.identity(5), index=np.arange(5))
     sf_dropped = sf.drop_duplicate_idx()
-    assert np.all(sf_dropped.data.todense() == sf.data.todense())
+    assert np.all(sf_dropped.data.toarray() == sf.data.toarray())
 
     sf = SparseFrame(np.identity(8), index=[0, 0, 2, 3, 3, 5, 5, 5])
     sf_dropped = sf.drop_duplicate_idx()
     correct = np.identity(8)[[0, 2, 3, 5], :]
-    assert np.all(sf_dropped.data.todense() == correct)
+    assert np.all(sf_dropped.data.toarray() == correct)
 
 
 def test_repr():
@@ -819,18 +958,27 @@ def test_repr():
     assert isinstance(res, str)
 
 
+def test_head(sample_frame_labels):
+    res = sample_frame_labels.head(2)
+    assert isinstance(res, SparseFrame)
+    assert res.shape == (2, 5)
+    assert np.all(res.index == list('VW'))
+    assert np.all(res.data.toarray() == np.identity(5)[:2])
+    assert sample_frame_labels.head(10).shape == (5, 5)
+
+
 def test_groupby_agg(groupby_frame):
     res = groupby_frame.groupby_agg(
         level=0,
         agg_func=lambda x: x.sum(axis=0)
-    ).data.todense()
+    ).data.toarray()
     assert np.all(res == (np.identity(10) * 10))
 
     res = groupby_frame.groupby_agg(
         level=0,
         agg_func=lambda x: x.mean(axis=0)
     )
-    assert np.all(res.data.todense().round() == np.identity(10))
+    assert np.all(res.data.toarray().round() == np.identity(10))
 
     assert np.all(res.columns == groupby_frame.columns)
     assert np.all(res.index == groupby_frame.index.unique().sort_values())
@@ -877,7 +1025,7 @@ def test_init_with_pandas():
     sf = SparseFrame(s)
 
     assert sf.shape == (10, 1)
-    assert np.all(sf.data.todense() == np.ones(10).reshape(-1, 1))
+    assert np.all(sf.data.toarray() == np.ones(10).reshape(-1, 1))
 
     df['A'] = 'bla'
     with pytest.raises(TypeError):
@@ -960,7 +1108,7 @@ def test_drop_single_label():
 
     correct = np.identity(5)[:, 1:]
     assert sf.columns.tolist() == list('BCDE')
-    np.testing.assert_array_equal(sf.data.todense(), correct)
+    np.testing.assert_array_equal(sf.data.toarray(), correct)
 
 
 def test_drop_non_existing_label():
@@ -976,7 +1124,7 @@ def test_drop_multiple_labels():
 
     correct = np.identity(5)[:, [1, 3, 4]]
     assert sf.columns.tolist() == list('BDE')
-    np.testing.assert_array_equal(sf.data.todense(), correct)
+    np.testing.assert_array_equal(sf.data.toarray(), correct)
 
 
 def test_label_based_indexing_col(sample_frame_labels):
@@ -988,7 +1136,7 @@ def test_label_based_indexing_col(sample_frame_labels):
     ]
     for res in results:
         np.testing.assert_array_equal(
-            res.data.todense(), np.identity(5)[:, :2])
+            res.data.toarray(), np.identity(5)[:, :2])
         assert (res.index == pd.Index(list('VWXYZ'))).all()
         assert (res.columns == pd.Index(list('AB'))).all()
 
@@ -1003,7 +1151,7 @@ def test_label_based_indexing_idx(sample_frame_labels):
     ]
     for res in results:
         np.testing.assert_array_equal(
-            res.data.todense(), np.identity(5)[2:, :])
+            res.data.toarray(), np.identity(5)[2:, :])
         assert (res.index == pd.Index(['X', 'Y', 'Z'])).all()
         assert (res.columns == pd.Index(list('ABCDE'))).all()
 
@@ -1017,7 +1165,7 @@ def test_label_based_col_and_idx(sample_frame_labels):
     ]
     for res in results:
         np.testing.assert_array_equal(
-            res.data.todense(), np.identity(2))
+            res.data.toarray(), np.identity(2))
         assert (res.index == pd.Index(list('VW'))).all()
         assert (res.columns == pd.Index(list('AB'))).all()
 
@@ -1025,17 +1173,25 @@ def test_label_based_col_and_idx(sample_frame_labels):
 def test_indexing_boolean_label_col_and_idx(sample_frame_labels):
     res = sample_frame_labels.loc[[True, True, False, False, False], ['A', 'B']]
     np.testing.assert_array_equal(
-        res.data.todense(), np.identity(2))
+        res.data.toarray(), np.identity(2))
     assert (res.index == pd.Index(list('VW'))).all()
     assert (res.columns == pd.Index(list('AB'))).all()
 
     res = sample_frame_labels.loc[['V', 'W'], [True, True, False, False, False]]
     np.testing.assert_array_equal(
-        res.data.todense(), np.identity(2))
+        res.data.toarray(), np.identity(2))
     assert (res.index == pd.Index(list('VW'))).all()
     assert (res.columns == pd.Index(list('AB'))).all()
 
 
+def test_reindex_missing_columns():
+    sf = SparseFrame(np.identity(2), columns=['a', 'b'])
+    res = sf.reindex(['b', 'z', 'a'], axis=1)
+    assert res.columns.tolist() == ['b', 'z', 'a']
+    np.testing.assert_array_equal(res.data.toarray(),
+                                  [[0, 0, 1], [1, 0, 0]])
+
+
 def test_error_reindex_duplicate_axis():
     sf = SparseFrame(np.identity(5),
                      columns = list('ABCDE'),
@@ -1048,11 +1204,11 @@ def test_empty_elemwise():
     sf_empty = SparseFrame(np.array([]), columns=['A', 'B'])
     sf = SparseFrame(np.identity(2), columns=['A', 'B'])
 
-    res = sf_empty.add(sf).data.todense()
-    assert np.all(res == sf.data.todense())
+    res = sf_empty.add(sf).data.toarray()
+    assert np.all(res == sf.data.toarray())
 
-    res = sf.add(sf_empty).data.todense()
-    assert np.all(res == sf.data.todense())
+    res = sf.add(sf_empty).data.toarray()
+    assert np.all(res == sf.data.toarray())
 
     with pytest.raises(ValueError):
         res = sf.add(sf_empty, fill_value=None)
@@ -1091,7 +1247,7 @@ def test_reset_index(sample_frame_labels):
     correct = pd.RangeIndex(0, len(sample_frame_labels))
     pdt.assert_index_equal(res.index, correct)
     pdt.assert_index_equal(res.columns, sample_frame_labels.columns)
-    assert np.all(sample_frame_labels.data.todense() == res.data.todense())
+    assert np.all(sample_frame_labels.data.toarray() == res.data.toarray())
 
 
 def test_sample_n(sf_arange):